@@ -1,27 +1,46 @@
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 import streamlit as st
 
 from constants import *
 from regulations_service import RegulationService
 from calendar_service import CalendarService
-from main import UniversityQueryAgent
+from main import UniversityQueryAgent, UniversityResources
 from student_generator_util import generate_student_data_csv
 
 sys.modules['torch.classes'] = None
 
 
+@st.cache_resource
+def get_shared_resources(faiss_regulations_index: str, faiss_calendar_index: str, students_csv: str):
+    """
+    Loads the LLM client, embeddings, vector stores and student data once per process.
+
+    Only these stateless parts are shared across sessions; each session builds its
+    own agent, conversation memory and DataFrame copy on top of them.
+
+    Args:
+        faiss_regulations_index (str): Directory path of the regulations FAISS index.
+        faiss_calendar_index (str): Directory path of the calendar FAISS index.
+        students_csv (str): Path to the student data CSV file.
+    Returns:
+        UniversityResources: The cached shared resources.
+    """
+    return UniversityResources(faiss_regulations_index, faiss_calendar_index, students_csv)
+
+
 class QueryApp:
     def __init__(self):
         self.title = "University Regulations, Calendar & Student Data Query Tool"
         self.query_key = "query_input"
         self.chat_history_key = "chat_history"
         self.service_init_key = "services_initialized"
-        self.student_data_key = "student_data_generated"
-        self.faq_agent_key = "faq_agent_initialized"
+        self.faq_agent_key = "faq_agent"
+        self.faq_agent = None
 
     def setup(self):
-        self._generate_students()
         self._initialize_services()
         self._initialize_chat_history()
         self._initialize_faq_agent(FAISS_REGULATIONS_INDEX_NAME, FAISS_CALENDAR_INDEX_NAME, STUDENTS_CSV)
@@ -35,21 +54,20 @@ class QueryApp:
 
     def _initialize_faq_agent(self, faiss_regulations_index: str, faiss_calendar_index: str, students_csv: str):
         if self.faq_agent_key not in st.session_state:
-            st.session_state[self.faq_agent_key] = UniversityQueryAgent(
-                faiss_regulations_index,
-                faiss_calendar_index,
-                students_csv
-            )
-
-    def _generate_students(self):
-        if self.student_data_key not in st.session_state:
-            generate_student_data_csv(STUDENTS_CSV, NUMBER_OF_STUDENTS, COURSE_PRICE)
-            st.session_state[self.student_data_key] = True
+            resources = get_shared_resources(faiss_regulations_index, faiss_calendar_index, students_csv)
+            st.session_state[self.faq_agent_key] = UniversityQueryAgent(resources)
+        self.faq_agent = st.session_state[self.faq_agent_key]
 
     def _initialize_services(self):
         if self.service_init_key not in st.session_state:
-            CalendarService.setup(CALENDAR_EVENTS, NUMBER_OF_EVENTS, FAISS_CALENDAR_INDEX_NAME)
-            RegulationService.setup(REGULATIONS_PDF, FAISS_REGULATIONS_INDEX_NAME, NUMBER_OF_REGULATIONS_CHUNKS)
+            setup_steps = [
+                partial(CalendarService.setup, CALENDAR_EVENTS, NUMBER_OF_EVENTS, FAISS_CALENDAR_INDEX_NAME),
+                partial(RegulationService.setup, REGULATIONS_PDF, FAISS_REGULATIONS_INDEX_NAME,
+                        NUMBER_OF_REGULATIONS_CHUNKS),
+                partial(generate_student_data_csv, STUDENTS_CSV, NUMBER_OF_STUDENTS, COURSE_PRICE)
+            ]
+            with ThreadPoolExecutor(max_workers=len(setup_steps)) as executor:
+                list(executor.map(lambda step: step(), setup_steps))
             st.session_state[self.service_init_key] = True
 
     def _initialize_chat_history(self):
@@ -66,15 +84,23 @@ class QueryApp:
                 self.chat_history_key]
 
     def _generate_response(self, query):
-        return st.session_state[self.faq_agent_key].generate_response(query)
+        response = {"output": "No response was generated."}
+        with st.status("Processing your query...") as status:
+            for chunk in self.faq_agent.stream_response(query):
+                for action in chunk.get("actions", []):
+                    status.write(f"Using tool: {action.tool}")
+                if "output" in chunk:
+                    response = chunk
+            status.update(label="Done", state="complete")
+        return response
 
     def _display_chat_history(self):
         st.write("### Chat History:")
         with st.container():
-            for entry in st.session_state[self.chat_history_key]:
-                st.markdown(f"**User:** {entry['query']}")
-                st.markdown(f"**Assistant:** {entry['response']['output']}")
-                st.write("---")
+            st.markdown("".join(
+                f"**User:** {entry['query']}\n\n**Assistant:** {entry['response']['output']}\n\n---\n\n"
+                for entry in st.session_state[self.chat_history_key]
+            ))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,60 @@
+from functools import lru_cache
+from typing import List
+
+from pydantic import ConfigDict
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from langchain_community.vectorstores import FAISS
+
+from embeddings_singleton import get_embeddings
+
+
+@lru_cache(maxsize=1024)
+def _embed_query(query: str):
+    """
+    Embeds a query once with the shared embedding model, so every vector store reuses it.
+
+    Args:
+        query (str): The normalized query.
+    Returns:
+        tuple[float, ...]: The query embedding.
+    """
+    return tuple(get_embeddings().embed_query(query))
+
+
+@lru_cache(maxsize=1024)
+def _cached_search(vector_store: FAISS, query: str, k: int):
+    """
+    Runs a similarity search and memoizes the result per vector store, query and k.
+
+    The query vector comes from _embed_query, so a query sent to several stores
+    only passes through the embedding model once.
+
+    Args:
+        vector_store (FAISS): The store to search.
+        query (str): The normalized query.
+        k (int): Number of documents to return.
+    Returns:
+        tuple: (doc_id, page_content, metadata, score) entries in ranking order.
+    """
+    results = vector_store.similarity_search_with_score_by_vector(list(_embed_query(query)), k=k)
+    return tuple((doc.id, doc.page_content, doc.metadata, score) for doc, score in results)
+
+
+class CachedRetriever(BaseRetriever):
+    """
+    Vector store retriever that serves repeated queries from a process-wide LRU cache.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    vector_store: FAISS
+    k: int = 4
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        results = _cached_search(self.vector_store, query.strip().lower(), self.k)
+        return [
+            Document(id=doc_id, page_content=page_content, metadata=dict(metadata))
+            for doc_id, page_content, metadata, _ in results
+        ]
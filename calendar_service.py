@@ -1,11 +1,16 @@
-import json
-import random
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
+
+import numpy as np
+import orjson
+import pandas as pd
 
 from langchain_community.document_loaders import JSONLoader
-from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
+
+from embeddings_singleton import get_embeddings, index_matches_embeddings
+from faiss_index_util import create_vector_store, save_vector_store
+
+_INDEX_EXISTS = "Index already exists"
 
 
 class CalendarService:
@@ -37,30 +42,41 @@ class CalendarService:
             - Writes a new JSON file containing generated calendar events.
             - Creates and saves a FAISS index to disk.
         """
-        if os.path.exists(calendar_path):
-            if not os.path.exists(index_path):
+        if os.path.isfile(calendar_path):
+            if not index_matches_embeddings(index_path):
                 return CalendarService.create_calendar_vector_index(calendar_path, index_path, new_index=True)
-            return "Index already exists"
-
-        events = []
-        titles = ["Meeting", "Workshop", "Conference", "Lunch", "Project Review", "Lab", "Lecture"]
-        locations = ["Office", "Zoom", "Conference Hall", "Cafe", "Online"]
-
-        for _ in range(random.randint(5, num_events)):
-            start_time = datetime.now() + timedelta(days=random.randint(1, 30), hours=random.randint(8, 18))
-            end_time = start_time + timedelta(hours=random.randint(1, 3))
-
-            event = {
-                "title": random.choice(titles),
-                "location": random.choice(locations),
-                "start_time": start_time.isoformat(),
-                "end_time": end_time.isoformat(),
-                "attendees": [f"user{random.randint(1, 10)}@example.com" for _ in range(random.randint(1, 5))]
-            }
-            events.append(event)
-
-        with open(calendar_path, "w") as json_file:
-            json.dump(events, json_file, indent=4)
+            return _INDEX_EXISTS
+
+        titles = np.array(["Meeting", "Workshop", "Conference", "Lunch", "Project Review", "Lab", "Lecture"])
+        locations = np.array(["Office", "Zoom", "Conference Hall", "Cafe", "Online"])
+
+        # Draw every random field for all events at once
+        n = np.random.randint(5, num_events + 1)
+        title_idx = np.random.randint(0, len(titles), n)
+        location_idx = np.random.randint(0, len(locations), n)
+        day_offsets = np.random.randint(1, 31, n)
+        hour_offsets = np.random.randint(8, 19, n)
+        durations = np.random.randint(1, 4, n)
+        attendee_counts = np.random.randint(1, 6, n)
+        attendee_ids = np.random.randint(1, 11, (n, 5))
+
+        start_times = (np.datetime64(datetime.now(), "s")
+                       + day_offsets.astype("timedelta64[D]")
+                       + hour_offsets.astype("timedelta64[h]"))
+        end_times = start_times + durations.astype("timedelta64[h]")
+
+        attendee_emails = np.char.add(np.char.add("user", attendee_ids.astype(str)), "@example.com").tolist()
+
+        events = pd.DataFrame({
+            "title": titles[title_idx].tolist(),
+            "location": locations[location_idx].tolist(),
+            "start_time": np.datetime_as_string(start_times).tolist(),
+            "end_time": np.datetime_as_string(end_times).tolist(),
+            "attendees": [emails[:count] for emails, count in zip(attendee_emails, attendee_counts.tolist())]
+        }).to_dict(orient="records")
+
+        with open(calendar_path, "wb") as json_file:
+            json_file.write(orjson.dumps(events, option=orjson.OPT_INDENT_2))
 
         return CalendarService.create_calendar_vector_index(calendar_path, index_path, new_index=True)
 
@@ -78,8 +94,8 @@ class CalendarService:
             str: A message indicating that the FAISS index was created or not
         """
 
-        if not new_index and os.path.exists(index_path):
-            return "Index already exists"
+        if not new_index and index_matches_embeddings(index_path):
+            return _INDEX_EXISTS
 
         # Load documents
         loader = JSONLoader(
@@ -90,10 +106,10 @@ class CalendarService:
         docs = loader.load()
 
         # Create embeddings and vector store
-        embeddings = HuggingFaceEmbeddings()
-        vector_store = FAISS.from_documents(docs, embeddings)
+        embeddings = get_embeddings()
+        vector_store = create_vector_store(docs, embeddings)
 
         # Save the index locally
-        vector_store.save_local(index_path)
+        save_vector_store(vector_store, index_path)
 
         return "Index created"
@@ -7,3 +7,7 @@ NUMBER_OF_STUDENTS = 300
 COURSE_PRICE = 250
 REGULATIONS_PDF = "University_regulations.pdf"
 NUMBER_OF_REGULATIONS_CHUNKS = 25
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# Opt-in: needs optimum[onnxruntime] and a CPU with AVX-512 VNNI
+EMBEDDING_USE_ONNX = False
+EMBEDDING_ONNX_FILE = "onnx/model_qint8_avx512_vnni.onnx"
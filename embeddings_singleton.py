@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+
+from constants import EMBEDDING_MODEL, EMBEDDING_ONNX_FILE, EMBEDDING_USE_ONNX
+
+_embeddings = None
+_embeddings_lock = threading.Lock()
+
+# Written next to each saved index to record which embeddings built it
+_SIGNATURE_FILE = "embeddings.json"
+
+
+def get_embeddings():
+    """
+    Returns the process-wide HuggingFace embedding model, loading it on first use.
+
+    The calendar index, the regulations index and the query agent all share this
+    instance, so the sentence-transformers model is only loaded once per process,
+    even when the index builders run on separate threads. With EMBEDDING_USE_ONNX set,
+    the INT8-quantized ONNX Runtime export of the model runs on the CPU. Otherwise the
+    PyTorch model runs in half precision on the GPU when CUDA is available, and in
+    full precision on the CPU.
+
+    Returns:
+        HuggingFaceEmbeddings: The shared embedding model.
+    """
+    global _embeddings
+    if _embeddings is None:
+        with _embeddings_lock:
+            if _embeddings is None:
+                # Deferred so that importing this module never pulls in torch or transformers
+                import torch
+                from langchain_huggingface import HuggingFaceEmbeddings
+
+                if EMBEDDING_USE_ONNX:
+                    model_kwargs = {
+                        "device": "cpu",
+                        "backend": "onnx",
+                        "model_kwargs": {"file_name": EMBEDDING_ONNX_FILE}
+                    }
+                elif torch.cuda.is_available():
+                    model_kwargs = {"device": "cuda", "model_kwargs": {"torch_dtype": torch.float16}}
+                else:
+                    model_kwargs = {"device": "cpu"}
+                _embeddings = HuggingFaceEmbeddings(
+                    model_name=EMBEDDING_MODEL,
+                    model_kwargs=model_kwargs,
+                    encode_kwargs={"batch_size": 128, "normalize_embeddings": True}
+                )
+    return _embeddings
+
+
+def get_embedding_signature():
+    """
+    Identifies the embedding space get_embeddings() produces, without loading the model.
+
+    Returns:
+        dict: The signature of the current embeddings.
+    """
+    if EMBEDDING_USE_ONNX:
+        return {"model": EMBEDDING_MODEL, "backend": "onnx", "file_name": EMBEDDING_ONNX_FILE}
+    return {"model": EMBEDDING_MODEL, "backend": "torch"}
+
+
+def save_embedding_signature(index_path: str, dimension: int):
+    """
+    Records the current embedding signature and the vector dimension next to a saved index.
+
+    Args:
+        index_path (str): Directory path of the saved index.
+        dimension (int): Dimension of the vectors stored in the index.
+    """
+    with open(os.path.join(index_path, _SIGNATURE_FILE), "w") as signature_file:
+        json.dump({**get_embedding_signature(), "dimension": dimension}, signature_file)
+
+
+def index_matches_embeddings(index_path: str) -> bool:
+    """
+    Checks whether a saved index was built with the current embeddings.
+
+    Indexes saved without a signature, or with a different one, must be rebuilt,
+    since their vectors cannot be searched with queries from the current model.
+
+    Args:
+        index_path (str): Directory path of the saved index.
+    Returns:
+        bool: True if the index exists and matches the current embeddings.
+    """
+    try:
+        with open(os.path.join(index_path, _SIGNATURE_FILE)) as signature_file:
+            signature = json.load(signature_file)
+    except (OSError, ValueError):
+        return False
+    signature.pop("dimension", None)
+    return signature == get_embedding_signature()
@@ -0,0 +1,108 @@
+import os
+import pickle
+
+import faiss
+import numpy as np
+
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
+
+from embeddings_singleton import save_embedding_signature
+
+# Embeddings are unit-normalized, so inner product equals cosine similarity
+DISTANCE_STRATEGY = DistanceStrategy.MAX_INNER_PRODUCT
+
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+HNSW_EF_SEARCH = 64
+
+
+def create_vector_store(documents, embeddings, vectors=None, ef_construction: int = HNSW_EF_CONSTRUCTION,
+                        quantize: bool = False):
+    """
+    Builds an inner-product FAISS vector store backed by an HNSW index.
+
+    The HNSW index is created up front and filled directly with the document
+    vectors, so no intermediate flat index is built. With quantize, the graph stores
+    8-bit scalar-quantized vectors instead of float32, a quarter of the size.
+
+    Args:
+        documents (list[Document]): Documents to store.
+        embeddings (Embeddings): Embedding model producing unit-normalized vectors.
+        vectors (list[list[float]] | None): Precomputed document embeddings, in the same order
+            as documents. Documents are embedded with one embed_documents call when omitted.
+        ef_construction (int): Candidate list size used while building the HNSW graph.
+        quantize (bool): Store vectors as 8-bit scalar codes instead of float32.
+    Returns:
+        FAISS: The populated vector store.
+    """
+    if vectors is None:
+        vectors = embeddings.embed_documents([doc.page_content for doc in documents])
+
+    dimension = len(vectors[0])
+    if quantize:
+        index = faiss.IndexHNSWSQ(dimension, faiss.ScalarQuantizer.QT_8bit, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        # The quantizer learns per-dimension value ranges from the vectors it will encode
+        index.train(np.ascontiguousarray(vectors, dtype="float32"))
+    else:
+        index = faiss.IndexHNSWFlat(dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = ef_construction
+
+    vector_store = FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore(),
+        index_to_docstore_id={},
+        distance_strategy=DISTANCE_STRATEGY
+    )
+    vector_store.add_embeddings(
+        [(doc.page_content, vector) for doc, vector in zip(documents, vectors)],
+        metadatas=[doc.metadata for doc in documents]
+    )
+
+    # efSearch is saved with the index, so it applies when the store is loaded again
+    index.hnsw.efSearch = HNSW_EF_SEARCH
+    return vector_store
+
+
+def save_vector_store(vector_store: FAISS, index_path: str):
+    """
+    Saves a FAISS vector store along with the signature of the embeddings that built it.
+
+    Args:
+        vector_store (FAISS): The vector store to save.
+        index_path (str): Directory path to save the FAISS index.
+    """
+    vector_store.save_local(index_path)
+    save_embedding_signature(index_path, vector_store.index.d)
+
+
+def load_vector_store(index_path: str, embeddings):
+    """
+    Loads a FAISS vector store saved by create_vector_store.
+
+    The docstore is unpickled directly and the FAISS index is read with its stored
+    vectors memory-mapped read-only, so only the HNSW graph is copied into memory
+    and the vectors are paged in lazily and shared through the OS page cache.
+
+    Args:
+        index_path (str): Directory path of the saved FAISS index.
+        embeddings (Embeddings): Embedding model used to embed queries.
+    Returns:
+        FAISS: The loaded vector store.
+    """
+    # Same files and pickle layout that FAISS.save_local writes
+    with open(os.path.join(index_path, "index.pkl"), "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+    index = faiss.read_index(
+        os.path.join(index_path, "index.faiss"),
+        faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY
+    )
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id=index_to_docstore_id,
+        distance_strategy=DISTANCE_STRATEGY
+    )
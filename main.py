@@ -1,82 +1,99 @@
+import os
+
 import pandas as pd
 from dotenv import load_dotenv
 from datetime import datetime
 
 from langchain.agents import AgentType, initialize_agent
-from langchain_core.output_parsers import StrOutputParser
-from langchain.prompts import PromptTemplate
 from langchain.memory import ConversationBufferMemory
 from langchain.chains import RetrievalQA
 
 from langchain_experimental.agents import create_pandas_dataframe_agent
+from langchain_experimental.tools.python.tool import sanitize_input
 from langchain_community.tools import Tool
-from langchain_community.vectorstores import FAISS
 
-from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_groq import ChatGroq
 
+from cached_retriever import CachedRetriever
+from embeddings_singleton import get_embeddings
+from faiss_index_util import load_vector_store
+from pandas_code_guard import is_read_only_code
+from student_generator_util import STUDENTS_SCHEMA, get_parquet_path
+
+MODIFICATION_BLOCKED = "Modification blocked: This query is not allowed. Only read-only queries are permitted."
+
+
+class UniversityResources:
+    """
+    Heavy, stateless components shared by every query agent in the process:
+    the LLM client, the embeddings, both vector stores and the student data.
+    """
 
-class UniversityQueryAgent:
     def __init__(self, faiss_regulations_index: str, faiss_calendar_index: str, students_csv: str):
         load_dotenv()
 
         self.llm = ChatGroq(model_name="meta-llama/llama-4-maverick-17b-128e-instruct", temperature=0)
 
-        # Load student data
-        self.df = pd.read_csv(students_csv)
+        # Load student data, preferring the parquet copy unless the CSV was changed after it
+        students_parquet = get_parquet_path(students_csv)
+        if os.path.exists(students_parquet) and os.path.getmtime(students_parquet) >= os.path.getmtime(students_csv):
+            self.df = pd.read_parquet(students_parquet, engine="pyarrow", dtype_backend="pyarrow", memory_map=True)
+        else:
+            self.df = pd.read_csv(
+                students_csv,
+                dtype_backend="pyarrow",
+                dtype={field.name: pd.ArrowDtype(field.type) for field in STUDENTS_SCHEMA}
+            )
+
+        # Embeddings and vector stores
+        self.embeddings = get_embeddings()
+        self.vector_store_regulations = load_vector_store(faiss_regulations_index, self.embeddings)
+        self.vector_store_calendar = load_vector_store(faiss_calendar_index, self.embeddings)
+
+
+class UniversityQueryAgent:
+    def __init__(self, resources: UniversityResources):
+        self.llm = resources.llm
+
+        # Each agent works on its own copy of the student data
+        self.df = resources.df.copy()
         self.column_names = self.df.columns.tolist()
 
         # Embeddings
-        self.embeddings = HuggingFaceEmbeddings()
+        self.embeddings = resources.embeddings
 
         # Load regulation retriever
-        self.vector_store_regulations = FAISS.load_local(
-            faiss_regulations_index,
-            self.embeddings,
-            allow_dangerous_deserialization=True
-        )
-        self.retrieval_chain_regulations = RetrievalQA.from_chain_type(
-            llm=self.llm,
-            retriever=self.vector_store_regulations.as_retriever(search_kwargs={"k": 3}),
-            chain_type="refine"
+        self.vector_store_regulations = resources.vector_store_regulations
+        self.retrieval_chain_regulations = self._create_retrieval_chain(
+            self.vector_store_regulations, k=3, chain_type="stuff"
         )
         self.regulation_tool = Tool(
             name="University regulations retriever",
-            func=lambda query: self.retrieval_chain_regulations.invoke(query),
+            func=lambda query: self.retrieval_chain_regulations.invoke(query)["result"],
             description="Retrieves and synthesizes information about university's academic regulations and guidelines."
         )
 
         # Load calendar retriever
-        self.vector_store_calendar = FAISS.load_local(
-            faiss_calendar_index,
-            self.embeddings,
-            allow_dangerous_deserialization=True
-        )
-        self.retrieval_chain_calendar = RetrievalQA.from_chain_type(
-            llm=self.llm,
-            retriever=self.vector_store_calendar.as_retriever(search_kwargs={"k": 20}),
-            return_source_documents=True
+        self.vector_store_calendar = resources.vector_store_calendar
+        self.retrieval_chain_calendar = self._create_retrieval_chain(
+            self.vector_store_calendar, k=20
         )
         self.calendar_tool = Tool(
             name="Calendar events retriever",
-            func=lambda query: self.retrieval_chain_calendar.invoke(query),
+            func=lambda query: self.retrieval_chain_calendar.invoke(query)["result"],
             description="Retrieves information about upcoming calender events"
         )
 
-        # Create Pandas agent with protection
+        # Create Pandas agent with protection: its Python tool refuses code that could modify the DataFrame
         self.pandas_agent = create_pandas_dataframe_agent(
             self.llm, self.df, verbose=True, allow_dangerous_code=True
         )
-        self.classification_prompt = PromptTemplate(
-            input_variables=["query"],
-            template=(
-                f"Our pandas DataFrame has the following columns: {self.column_names}.\n"
-                "Determine if the following query entails the modification of the DataFrame:\n"
-                "{query}\n"
-                "Respond with 'SAFE' if it only reads data, otherwise respond with 'MODIFY'."
-            )
-        )
-        self.classifier = self.classification_prompt | self.llm | StrOutputParser()
+        python_tool = self.pandas_agent.tools[0]
+        self.pandas_agent.tools = [Tool(
+            name=python_tool.name,
+            func=lambda code: python_tool.run(code) if is_read_only_code(sanitize_input(code)) else MODIFICATION_BLOCKED,
+            description=python_tool.description
+        )]
 
         self.pandas_tool = Tool(
             name="Pandas student Data Frame Tool",
@@ -92,7 +109,8 @@ class UniversityQueryAgent:
         )
 
         # Memory and agent setup
-        self.memory = ConversationBufferMemory(memory_key="chat_history")
+        # Streamed results also carry the messages, so the memory is told which key holds the answer
+        self.memory = ConversationBufferMemory(memory_key="chat_history", output_key="output")
         self.agent = initialize_agent(
             tools=[self.regulation_tool, self.calendar_tool, self.pandas_tool, self.datetime_tool],
             llm=self.llm,
@@ -102,20 +120,38 @@ class UniversityQueryAgent:
             handle_parsing_errors=True
         )
 
+    def _create_retrieval_chain(self, vector_store, k: int, **chain_kwargs):
+        """
+        Builds a RetrievalQA chain that searches a vector store through the cached retriever.
+
+        Args:
+            vector_store (FAISS): The vector store to retrieve from.
+            k (int): Number of documents to retrieve per query.
+            **chain_kwargs: Extra arguments for RetrievalQA.from_chain_type.
+
+        Returns:
+            RetrievalQA: The retrieval chain.
+        """
+        return RetrievalQA.from_chain_type(
+            llm=self.llm,
+            retriever=CachedRetriever(vector_store=vector_store, k=k),
+            **chain_kwargs
+        )
+
     def safe_query_execution(self, query: str):
         """
-        Executes a query only if classified as 'SAFE'. Prevents modifications.
+        Executes a query against the student data. Prevents modifications.
+
+        Every piece of code the pandas agent generates is checked before it runs,
+        and code that could modify the DataFrame is refused.
 
         Args:
-            query (str): The query to be classified and executed.
+            query (str): The query to be executed.
 
         Returns:
-            Any: Query result if allowed, otherwise a warning message.
+            Any: Query result, or a warning message if the agent only produced modifying code.
         """
-        classification_result = self.classifier.invoke({"query": query})
-        if "SAFE" in classification_result:
-            return self.pandas_agent.invoke({"input": query})
-        return "Modification blocked: This query is not allowed. Only read-only queries are permitted."
+        return self.pandas_agent.invoke({"input": query})
 
     @staticmethod
     def get_current_datetime(query: str):
@@ -131,6 +167,8 @@ class UniversityQueryAgent:
         """
         Generates a response based on the input query using an agent.
 
+        Entry point for callers outside the Streamlit UI, which uses stream_response instead.
+
         Args:
             query (str): The query to process.
 
@@ -143,3 +181,23 @@ class UniversityQueryAgent:
             return {
                 'output': f'An error occurred while processing the query: {str(e)}'
             }
+
+    def stream_response(self, query: str):
+        """
+        Streams the agent's progress for the input query.
+
+        Yields the agent's intermediate chunks as they are produced: tool calls
+        ('actions'), tool observations ('steps') and finally the answer ('output').
+
+        Args:
+            query (str): The query to process.
+
+        Yields:
+            dict: Agent output chunks, or a single 'output' chunk with a default message on failure.
+        """
+        try:
+            yield from self.agent.stream({"input": query})
+        except Exception as e:
+            yield {
+                'output': f'An error occurred while processing the query: {str(e)}'
+            }
@@ -0,0 +1,163 @@
+import ast
+
+import numpy as np
+
+# Names the generated code may not rebind, since the REPL keeps them between calls
+_PROTECTED_NAMES = frozenset({"df", "np", "numpy"})
+
+# Names numpy may be imported under, so that calls into it can be recognized
+_NUMPY_NAMES = frozenset({"np", "numpy"})
+
+# Modules the generated code may import
+_SAFE_MODULES = frozenset({"pandas", "numpy", "math", "statistics", "datetime", "re", "collections"})
+
+# Builtins that could run arbitrary code or get around the attribute checks below
+_UNSAFE_BUILTINS = frozenset({
+    "exec", "eval", "compile", "open", "input", "breakpoint", "__import__",
+    "getattr", "setattr", "delattr", "globals", "locals", "vars"
+})
+
+# Methods that change their object in place whatever arguments they get, or hand out functions that can
+_MUTATING_METHODS = frozenset({
+    "insert", "pop", "popitem", "update", "setdefault", "clear", "sort", "partition", "shuffle", "fill",
+    "put", "put_along_axis", "putmask", "place", "copyto", "fill_diagonal", "resize", "setflags",
+    "setfield", "itemset", "set_flags", "at", "frompyfunc", "to_clipboard"
+})
+
+# Number of inputs of every numpy ufunc; positional arguments past these are output arrays
+_UFUNC_INPUTS = {name: value.nin for name, value in vars(np).items() if isinstance(value, np.ufunc)}
+
+# Methods that may be handed a bare numpy ufunc, since they only call it with one input
+_ELEMENTWISE_APPLIERS = frozenset({"apply", "map", "applymap", "agg", "aggregate", "transform"})
+
+# to_* methods that only convert data and never write it anywhere
+_READ_ONLY_CONVERSIONS = frozenset({
+    "to_dict", "to_list", "to_numpy", "to_frame", "to_records", "to_period", "to_timestamp",
+    "to_pydatetime", "to_series", "to_flat_index"
+})
+
+# Keywords through which the remaining to_* methods write to a file, buffer or database
+_WRITER_KEYWORDS = frozenset({
+    "buf", "path", "path_or_buf", "path_or_buffer", "excel_writer", "con", "fname", "destination_table"
+})
+
+
+def is_read_only_code(code: str) -> bool:
+    """
+    Checks whether code generated by the pandas agent only reads data.
+
+    The check fails closed: code is rejected if it does not parse, assigns to
+    anything other than a plain local variable, uses augmented assignment (which
+    updates views of the DataFrame in place), rebinds or deletes anything, passes
+    ``inplace`` or ``out``, hands a numpy ufunc an output array, calls a mutating
+    method, touches private attributes, writes data out, imports a module outside
+    a small allowlist or uses builtins that could hide any of this.
+
+    Args:
+        code (str): The Python code to check.
+
+    Returns:
+        bool: True if the code is read-only, otherwise False.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return False
+
+    calls = {id(node.func): node for node in ast.walk(tree) if isinstance(node, ast.Call)}
+    attribute_values = {id(node.value) for node in ast.walk(tree) if isinstance(node, ast.Attribute)}
+    applied_functions = {
+        id(call.args[0]) for call in calls.values()
+        if isinstance(call.func, ast.Attribute) and call.func.attr in _ELEMENTWISE_APPLIERS and len(call.args) == 1
+    }
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Global, ast.Nonlocal, ast.AugAssign)):
+            return False
+        if isinstance(node, ast.Import) and any(
+            alias.name.split(".")[0] not in _SAFE_MODULES
+            or (alias.name.split(".")[0] == "numpy" and (alias.asname or "numpy") not in _NUMPY_NAMES)
+            for alias in node.names
+        ):
+            return False
+        if isinstance(node, ast.ImportFrom) and (node.module or "").split(".")[0] not in _SAFE_MODULES - {"numpy"}:
+            # numpy is only reachable through np/numpy, so that its ufuncs can be checked
+            return False
+
+        if isinstance(node, (ast.Name, ast.Attribute, ast.Subscript)):
+            if isinstance(node.ctx, ast.Del):
+                return False
+            if isinstance(node.ctx, ast.Store) and not (isinstance(node, ast.Name) and node.id not in _PROTECTED_NAMES):
+                return False
+        if isinstance(node, ast.Name) and (node.id in _UNSAFE_BUILTINS or node.id.startswith("__")):
+            return False
+        if isinstance(node, ast.Name) and node.id in _NUMPY_NAMES and id(node) not in attribute_values:
+            # numpy itself may not be aliased or passed around
+            return False
+        if isinstance(node, ast.Attribute) and not _is_read_only_attribute(
+                node, calls.get(id(node)), id(node) in applied_functions):
+            return False
+        if isinstance(node, ast.Call) and not _is_read_only_call(node):
+            return False
+    return True
+
+
+def _is_numpy_attribute(node: ast.Attribute) -> bool:
+    """
+    Checks whether an attribute reference is reached from numpy, e.g. ``np.multiply``.
+
+    Args:
+        node (ast.Attribute): The attribute reference.
+
+    Returns:
+        bool: True if the reference starts at a numpy name.
+    """
+    value = node.value
+    while isinstance(value, ast.Attribute):
+        value = value.value
+    return isinstance(value, ast.Name) and value.id in _NUMPY_NAMES
+
+
+def _is_read_only_attribute(node: ast.Attribute, call: ast.Call | None, applied: bool) -> bool:
+    """
+    Checks a single attribute reference, given the call it is the target of, if any.
+
+    Args:
+        node (ast.Attribute): The attribute reference.
+        call (ast.Call | None): The call made on the attribute, or None if it is not called directly.
+        applied (bool): Whether the attribute is the only argument of an elementwise applier like apply.
+
+    Returns:
+        bool: True if the attribute reference is read-only, otherwise False.
+    """
+    if node.attr.startswith("_") or node.attr in _MUTATING_METHODS:
+        return False
+    if node.attr in _UFUNC_INPUTS and _is_numpy_attribute(node):
+        # A ufunc writes into any positional argument past its inputs
+        if call is not None:
+            return len(call.args) <= _UFUNC_INPUTS[node.attr]
+        return applied
+    if node.attr.startswith("to_") and node.attr not in _READ_ONLY_CONVERSIONS:
+        # Writers are only allowed when called directly with nowhere to write to
+        return call is not None and not call.args and not any(
+            keyword.arg in _WRITER_KEYWORDS for keyword in call.keywords
+        )
+    return True
+
+
+def _is_read_only_call(node: ast.Call) -> bool:
+    """
+    Checks the keyword arguments of a single call.
+
+    Args:
+        node (ast.Call): The call.
+
+    Returns:
+        bool: True if the call's keywords cannot make it modify data, otherwise False.
+    """
+    for keyword in node.keywords:
+        if keyword.arg is None or keyword.arg == "out":
+            # **kwargs could hide inplace=True or a destination, and out= writes into an existing array
+            return False
+        if keyword.arg == "inplace" and not (isinstance(keyword.value, ast.Constant) and keyword.value.value is False):
+            return False
+    return True
@@ -1,12 +1,17 @@
+import mmap
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from pypdf import PdfReader
+from pypdf.errors import EmptyFileError
 
-from langchain.schema import Document
+from embeddings_singleton import get_embeddings, index_matches_embeddings
 
-from langchain_experimental.text_splitter import SemanticChunker
-from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
+_INDEX_EXISTS = "Index already exists"
+
+# MiniLM truncates its input at 256 word pieces, roughly 1000 characters, so longer chunks lose text
+_MAX_CHUNK_SIZE = 1000
 
 
 class RegulationService:
@@ -20,35 +25,90 @@ class RegulationService:
         return regulation_index_result
 
     @staticmethod
-    def create_regulations_vector_index(pdf_path: str, index_path: str, number_of_chunks: int = 25):
+    def extract_pdf_text(pdf_path: str, max_workers: int = 8):
         """
-        Processes a PDF file, splits its content into semantic chunks, and creates a FAISS vector index.
+        Extracts the text of every page of a PDF, spreading the pages over worker threads.
+
+        Each page is extracted exactly once. pypdf readers are not thread-safe, so every
+        worker thread parses its own read-only memory map of the file. The maps share the
+        OS page cache instead of each thread reading the whole file up front; pypdf still
+        copies the byte ranges it parses.
+
+        Args:
+            pdf_path (str): Path to the PDF.
+            max_workers (int): Maximum number of extraction threads.
+        Returns:
+            str: The text of all non-empty pages, separated by newlines.
+        """
+        thread_state = threading.local()
+        mapped_files = []
+
+        with open(pdf_path, "rb") as pdf_file:
+            # An empty file cannot be memory-mapped, so report it the way pypdf would
+            if os.fstat(pdf_file.fileno()).st_size == 0:
+                raise EmptyFileError(f"Cannot read an empty file: {pdf_path}")
+
+            def open_reader():
+                mapped_file = mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ)
+                mapped_files.append(mapped_file)
+                return PdfReader(mapped_file, strict=False)
+
+            def extract_page(page_number: int):
+                if not hasattr(thread_state, "reader"):
+                    thread_state.reader = open_reader()
+                return thread_state.reader.pages[page_number].extract_text()
+
+            try:
+                num_pages = len(open_reader().pages)
+                with ThreadPoolExecutor(max_workers=max(1, min(max_workers, num_pages))) as executor:
+                    pages = list(executor.map(extract_page, range(num_pages)))
+            finally:
+                for mapped_file in mapped_files:
+                    mapped_file.close()
+
+        return "\n".join(page for page in pages if page)
+
+    @staticmethod
+    def create_regulations_vector_index(pdf_path: str, index_path: str, number_of_chunks: int = 25,
+                                        quantize: bool = True):
+        """
+        Processes a PDF file, splits its content into overlapping text chunks, and creates a FAISS vector index.
 
         Args:
             pdf_path (str): Path to the regulations PDF.
             index_path (str): Directory path to save the FAISS index.
-            number_of_chunks (int): Number of semantic chunks to create.
+            number_of_chunks (int): Approximate number of chunks to create; sets the chunk size,
+                which is capped at what the embedding model reads.
+            quantize (bool): Store the index as 8-bit scalar-quantized vectors instead of float32.
         Returns:
             str: A message indicating that the FAISS index was created or not
         """
 
-        if os.path.exists(index_path):
-            return "Index already exists"
+        if index_matches_embeddings(index_path):
+            return _INDEX_EXISTS
+
+        # Deferred so that an up-to-date index never pulls in the text splitter or FAISS
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+        from faiss_index_util import create_vector_store, save_vector_store
 
         # Extract text from the PDF
-        reader = PdfReader(pdf_path)
-        text = "\n".join([page.extract_text() for page in reader.pages if page.extract_text()])
+        text = RegulationService.extract_pdf_text(pdf_path)
 
-        # Create semantic chunks
-        embeddings = HuggingFaceEmbeddings()
-        text_splitter = SemanticChunker(embeddings, number_of_chunks=number_of_chunks)
-        docs = text_splitter.create_documents([text])
+        # Split into fixed-size chunks on paragraph, line and sentence boundaries
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=min(_MAX_CHUNK_SIZE, max(500, len(text) // number_of_chunks)),
+            chunk_overlap=100,
+            separators=["\n\n", "\n", ". ", " ", ""]
+        )
+        documents = text_splitter.create_documents([text])
 
-        # Wrap into LangChain Documents
-        documents = [Document(page_content=doc.page_content) for doc in docs]
+        # Embed every chunk in one batched pass
+        embeddings = get_embeddings()
+        vectors = embeddings.embed_documents([doc.page_content for doc in documents])
 
-        # Embed and save FAISS index
-        vector_store = FAISS.from_documents(documents, embeddings)
-        vector_store.save_local(index_path)
+        # Save FAISS index
+        vector_store = create_vector_store(documents, embeddings, vectors, ef_construction=200, quantize=quantize)
+        save_vector_store(vector_store, index_path)
 
         return "Index created"
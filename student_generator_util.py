@@ -1,16 +1,140 @@
 import os
-import random
-import csv
+from itertools import chain
+from multiprocessing import get_context
 
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 from faker import Faker
 
+_STUDENTS_EXIST = "Students already exist"
+
+# Number of pre-generated Faker values that names and nationalities are drawn from
+_FAKER_POOL_SIZE = 256
+
+# Student count above which generation is split across worker processes
+_PARALLEL_THRESHOLD = 5000
+
+# Courses offered in each semester, as tuples so they can be sampled without copying
+_COURSES = {
+    1: ("Introduction to Informatics 1", "Introduction to Computer Architecture", "Discrete Structures",
+        "Fundamentals of Programming (Exercises & Laboratory)", "English 1"),
+    2: ("Introduction to Informatics 2", "Basic Principles of Operating Systems and System Software",
+        "Analysis for Informatics", "Laboratory: Computer Organization and Computer Architecture", "English 2"),
+    3: ("Databases 1", "Fundamentals of Algorithms and Data Structure", "Linear Algebra for Informatics",
+        "Minor subject 1", "Minor subject 2"),
+    4: ("Scripting Languages", "Introduction to Theory of Computation", "Discrete Probability Theory",
+        "Minor subject 3", "Minor subject 4"),
+    5: ("Numerical Programming", "Introduction to Software Engineering", "Minor subject 5",
+        "Elective 1", "Minor subject 6"),
+    6: ("Introduction to Computer Networking and Distributed Systems", "Databases 2", "Elective 2",
+        "Software Engineering Practical Course (Project System Development)", "Minor subject 7"),
+    7: ("Elective 3", "Elective 4", "Elective 5", "Internship"),
+    8: ("Elective 6", "Elective 7", "Bachelor's Thesis/Capstone Project")
+}
+_LENGTHS = {sem: len(courses) for sem, courses in _COURSES.items()}
+
+# Discount rates and their CSV labels, indexed together
+_DISCOUNT_RATES = np.array([0, 0.3, 0.5, 1])
+_DISCOUNT_LABELS = np.array(["0%", "30%", "50%", "100%"])
+
+# Column types of the student files; the CSV is read back with these so both files load identically
+STUDENTS_SCHEMA = pa.schema([
+    ("name", pa.string()),
+    ("surname", pa.string()),
+    ("nationality", pa.string()),
+    ("semester", pa.int64()),
+    ("all_courses", pa.string()),
+    ("discount_rate", pa.string()),
+    ("tuition_fees", pa.float64())
+])
+
+
+def get_parquet_path(file_path: str):
+    """
+    Returns the path of the parquet copy written next to a student CSV file.
+
+    Args:
+        file_path (str): Path of the student CSV file.
+    Returns:
+        str: The same path with a .parquet extension.
+    """
+    return os.path.splitext(file_path)[0] + ".parquet"
+
+
+def _generate_student_columns(num_students: int, course_price: int, seed=None):
+    """
+    Generates one batch of synthetic students as a dict of column lists.
+
+    Args:
+        num_students (int): Number of students in the batch.
+        course_price (int): Price per course in the tuition calculation.
+        seed (int | None): Seed for the batch's Faker and NumPy generators; unseeded when None.
+    Returns:
+        dict[str, list]: Column name to column values, in CSV column order.
+    """
+    # Only the person and address providers are needed for names and countries
+    faker = Faker(providers=["faker.providers.person", "faker.providers.address"])
+    faker.seed_instance(seed)
+    first_names = [faker.first_name() for _ in range(_FAKER_POOL_SIZE)]
+    last_names = [faker.last_name() for _ in range(_FAKER_POOL_SIZE)]
+    countries = [faker.country() for _ in range(_FAKER_POOL_SIZE)]
+    del faker
+
+    # Private generator with its methods bound to locals, avoiding global-state and attribute lookups
+    rng = np.random.default_rng(seed)
+    integers, choice, uniform = rng.integers, rng.choice, rng.random
+
+    # Draw semester, discount and identity fields for all students at once
+    semesters = integers(1, 9, num_students)
+    discount_idx = integers(0, len(_DISCOUNT_RATES), num_students)
+    discount_rates = _DISCOUNT_RATES[discount_idx]
+
+    # Number of courses taken per student and semester, zero for semesters not yet reached
+    course_counts = np.column_stack([
+        np.where(semesters >= sem, integers(2, length + 1, num_students), 0)
+        for sem, length in _LENGTHS.items()
+    ])
+    total_courses = course_counts.sum(axis=1)
+    tuition_fees = np.round(total_courses * course_price * (1 - discount_rates), 2)
+
+    # One random course order per student and semester, drawn for all students at once;
+    # a student's picks for a semester are the first course_counts entries of that order
+    shuffled_courses = [
+        np.asarray(_COURSES[sem])[np.argsort(uniform((num_students, length)), axis=1)].tolist()
+        for sem, length in _LENGTHS.items()
+    ]
+
+    # Each student's course string is built by a single join over their per-semester slices
+    all_courses = [
+        ", ".join(chain.from_iterable(
+            semester_courses[student][:num_selected]
+            for semester_courses, num_selected in zip(shuffled_courses, student_course_counts)
+        ))
+        for student, student_course_counts in enumerate(course_counts.tolist())
+    ]
+
+    return {
+        "name": choice(first_names, num_students).tolist(),
+        "surname": choice(last_names, num_students).tolist(),
+        "nationality": choice(countries, num_students).tolist(),
+        "semester": semesters.tolist(),
+        "all_courses": all_courses,
+        "discount_rate": _DISCOUNT_LABELS[discount_idx].tolist(),
+        "tuition_fees": tuition_fees.tolist()
+    }
+
 
 def generate_student_data_csv(file_path: str, num_students: int = 300, course_price: int = 250):
     """
-    Generates synthetic student enrollment data and saves it to a CSV file.
+    Generates synthetic student enrollment data and saves it to a CSV file,
+    plus a zstd-compressed parquet copy for fast loading.
 
     Each student is assigned a random semester (1 to 8), a selection of courses based on that semester,
     a random discount rate, and calculated tuition fees based on the selected courses and discount.
+    Above _PARALLEL_THRESHOLD students, batches are generated in spawned worker processes
+    with independent seeds when more than one CPU is available.
 
     Args:
         file_path (str): The output path for the generated CSV file.
@@ -19,60 +143,26 @@ def generate_student_data_csv(file_path: str, num_students: int = 300, course_pr
     Returns:
         None
     """
-    if os.path.exists(file_path):
-        return "Students already exist"
-
-    faker = Faker()
-    discounts = [0, 0.3, 0.5, 1]
-
-    courses_by_semester = {
-        1: ["Introduction to Informatics 1", "Introduction to Computer Architecture", "Discrete Structures",
-            "Fundamentals of Programming (Exercises & Laboratory)", "English 1"],
-        2: ["Introduction to Informatics 2", "Basic Principles of Operating Systems and System Software",
-            "Analysis for Informatics", "Laboratory: Computer Organization and Computer Architecture", "English 2"],
-        3: ["Databases 1", "Fundamentals of Algorithms and Data Structure", "Linear Algebra for Informatics",
-            "Minor subject 1", "Minor subject 2"],
-        4: ["Scripting Languages", "Introduction to Theory of Computation", "Discrete Probability Theory",
-            "Minor subject 3", "Minor subject 4"],
-        5: ["Numerical Programming", "Introduction to Software Engineering", "Minor subject 5",
-            "Elective 1", "Minor subject 6"],
-        6: ["Introduction to Computer Networking and Distributed Systems", "Databases 2", "Elective 2",
-            "Software Engineering Practical Course (Project System Development)", "Minor subject 7"],
-        7: ["Elective 3", "Elective 4", "Elective 5", "Internship"],
-        8: ["Elective 6", "Elective 7", "Bachelor's Thesis/Capstone Project"]
-    }
+    if os.path.isfile(file_path):
+        return _STUDENTS_EXIST
+
+    num_workers = os.cpu_count() or 1
+    if num_students > _PARALLEL_THRESHOLD and num_workers > 1:
+        batch_sizes = [num_students // num_workers + (i < num_students % num_workers) for i in range(num_workers)]
+        seeds = np.random.SeedSequence().generate_state(num_workers).tolist()
+        # Spawned rather than forked, since the caller may be a worker thread in a process with torch loaded
+        with get_context("spawn").Pool(num_workers) as pool:
+            batches = pool.starmap(
+                _generate_student_columns,
+                [(batch_size, course_price, seed) for batch_size, seed in zip(batch_sizes, seeds)]
+            )
+        columns = {name: [value for batch in batches for value in batch[name]] for name in batches[0]}
+    else:
+        columns = _generate_student_columns(num_students, course_price)
 
-    students = []
-
-    for _ in range(num_students):
-        semester = random.randint(1, 8)
-        all_courses = []
-        total_courses = 0
-
-        for sem in range(1, semester + 1):
-            available_courses = courses_by_semester[sem]
-            num_selected = random.randint(2, len(available_courses))
-            selected_courses = random.sample(available_courses, k=num_selected)
-            all_courses.extend(selected_courses)
-            total_courses += num_selected
-
-        discount_rate = random.choice(discounts)
-        total_tuition = total_courses * course_price * (1 - discount_rate)
-
-        students.append({
-            "name": faker.first_name(),
-            "surname": faker.last_name(),
-            "nationality": faker.country(),
-            "semester": semester,
-            "all_courses": ", ".join(all_courses),
-            "discount_rate": f"{int(discount_rate * 100)}%",
-            "tuition_fees": round(total_tuition, 2)
-        })
-
-    with open(file_path, mode="w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=["name", "surname", "nationality", "semester", "all_courses",
-                                                  "discount_rate", "tuition_fees"])
-        writer.writeheader()
-        writer.writerows(students)
+    # Both files are written from the same columnar table by pyarrow's C++ writers
+    table = pa.table(columns, schema=STUDENTS_SCHEMA)
+    pa_csv.write_csv(table, file_path)
+    pq.write_table(table, get_parquet_path(file_path), compression="zstd")
 
     return "Students have been created"
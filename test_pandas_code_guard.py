@@ -0,0 +1,77 @@
+import pytest
+
+from pandas_code_guard import is_read_only_code
+
+
+@pytest.mark.parametrize("code", [
+    "df['tuition_fees'].mean()",
+    "df[df['nationality'] == 'Germany'].shape[0]",
+    "df.groupby('nationality')['tuition_fees'].sum().sort_values(ascending=False).head()",
+    "df.sort_values('tuition_fees').head(10)",
+    "df.sort_values('tuition_fees', inplace=False)",
+    "print(df.to_string())",
+    "df.to_csv()",
+    "df.groupby('semester').size().to_dict()",
+    "import numpy as np\nnp.mean(df['semester'])",
+    "import numpy as np\nnp.sqrt(df['tuition_fees'])",
+    "import numpy as np\nnp.add(df['semester'], 1)",
+    "import numpy as np\ndf['tuition_fees'].apply(np.log1p)",
+    "s = df['tuition_fees']\nprint(s.max() - s.min())",
+    "a, *b = df.columns.tolist()",
+    "total = sum(fee for fee in df['tuition_fees'] if fee > 1000)",
+])
+def test_allows_reads(code):
+    assert is_read_only_code(code)
+
+
+@pytest.mark.parametrize("code", [
+    # Assignment through the DataFrame or its attributes
+    "df['tuition_fees'] = df['tuition_fees'] * 2",
+    "df.loc[df['tuition_fees'] > 1000, 'tuition_fees'] = 1000",
+    "df.surname = df.surname.str.capitalize()",
+    "df.attrs['owner'] = 'me'",
+    # Augmented assignment, including to local aliases of columns
+    "df['tuition_fees'] *= 2",
+    "s = df['tuition_fees']\ns *= 2",
+    "s = df['semester']\ns += 1",
+    "count = 0\ncount += 1",
+    # Rebinding or deleting
+    "df = df.sample(frac=1)",
+    "for df in [None]:\n    pass",
+    "np = None",
+    "del df['surname']",
+    "global df",
+    # In-place keywords and methods
+    "df.sort_values('tuition_fees', inplace=True)",
+    "df.drop(columns=['surname'], inplace=flag)",
+    "df.clip(upper=1000, **options)",
+    "df.insert(0, 'id', 1)",
+    "df.update(other)",
+    "df['tuition_fees'].values.sort()",
+    "import numpy as np\nnp.random.shuffle(df['semester'].values)",
+    "df._set_value(0, 'semester', 1)",
+    "df.__setitem__('semester', 1)",
+    # numpy output arrays
+    "import numpy as np\nx = df['tuition_fees'].values\nnp.multiply(x, 2, out=x)",
+    "import numpy as np\nx = df['tuition_fees'].values\nnp.multiply(x, 2, x)",
+    "import numpy as np\nnp.add.at(df['semester'].values, [0], 1)",
+    "import numpy as np\nmultiply = np.multiply",
+    "import numpy as np\nm = np",
+    "import numpy as n",
+    "from numpy import multiply",
+    # Writing data out
+    "df.to_csv('students.csv')",
+    "df.to_parquet(path='students.parquet')",
+    "df.to_xml(path_or_buffer='students.xml')",
+    "df.to_clipboard()",
+    "df.pipe(pd.DataFrame.to_csv, 'students.csv')",
+    # Imports and builtins that could get around the checks
+    "import os",
+    "exec('df.drop(columns=[\"surname\"], inplace=True)')",
+    "getattr(df, 'to_csv')('students.csv')",
+    "df.pipe(exec)",
+    # Unparseable code
+    "df[",
+])
+def test_rejects_mutations(code):
+    assert not is_read_only_code(code)